@@ -1,15 +1,108 @@
-import requests
-import pandas as pd
-import json
-from datetime import datetime, timedelta
+import asyncio
+import functools
+import importlib.util
+import re
 import time
+import weakref
+from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Optional, Dict, List
+
+import httpx
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+import pandas as pd
+import numpy as np
 import MetaTrader5 as mt5
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the scoring kernels run as plain Python loops
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Important US economic events picked out by get_specific_events
+IMPORTANT_EVENTS = MappingProxyType({
+    "Fed Interest Rate Decision": "fed_rate",
+    "CPI": "cpi",
+    "Core CPI": "core_cpi",
+    "Manufacturing PMI": "pmi_manufacturing",
+    "Services PMI": "pmi_services",
+    "PCE Price Index": "pce",
+    "Core PCE Price Index": "core_pce",
+    "FOMC Meeting Minutes": "fomc_minutes"
+})
+
+# Event types scored by analyze_event_impact
+FED_EVENT, INFLATION_EVENT, PMI_EVENT, GENERIC_EVENT = range(4)
+
+# Scoring rules, indexed by event type
+IMPACT_SCALE = np.array([2.0, 1.5, 1.0, 1.0])  # Fed surprises have doubled impact
+STRENGTH_DIVISOR = np.array([1.0, 1.0, 2.0, 1.0])
+HIGH_IMPACT_THRESHOLD = np.array([0.5, 0.3, 2.0, 0.5])
+HIGH_IMPACT_LABEL = np.array(["High", "High", "High", "Medium"])
+LOW_IMPACT_LABEL = np.array(["Medium", "Medium", "Medium", "Low"])
+UP_LABEL = np.array(["Hawkish", "Higher", "Expansion", "Positive"])
+DOWN_LABEL = np.array(["Dovish", "Lower", "Contraction", "Negative"])
+
+@njit(cache=True, fastmath=True)
+def score_surprises(kind, surprise, actual, scale, divisor, high_threshold,
+                    out_strength, out_high, out_rising):
+    """Score each event's surprise using the rules for its event type
+    
+    Inputs must not be NaN; rows with missing data are scored as zero surprise.
+    """
+    for i in range(len(kind)):
+        event_type = kind[i]
+        magnitude = abs(surprise[i]) * scale[event_type]
+        out_strength[i] = min(magnitude / divisor[event_type], 1.0)
+        out_high[i] = magnitude > high_threshold[event_type]
+        
+        # PMI direction follows the 50 expansion line rather than the surprise
+        if event_type == PMI_EVENT:
+            out_rising[i] = actual[i] > 50
+        else:
+            out_rising[i] = surprise[i] > 0
+
+# Gateway errors worth retrying; connection failures are retried by the transport
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+def _close_http_client(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient):
+    """Close an analyzer's HTTP client and the event loop that owns its connections"""
+    if not loop.is_closed():
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+async def _get_with_retries(client: httpx.AsyncClient, url: str, params: Dict,
+                            retries: int = 3, backoff: float = 0.3) -> httpx.Response:
+    """GET url, retrying gateway errors (502/503/504) with exponential backoff"""
+    for attempt in range(retries):
+        response = await client.get(url, params=params)
+        if response.status_code not in RETRY_STATUSES:
+            return response
+        await asyncio.sleep(backoff * 2 ** attempt)
+    return await client.get(url, params=params)
+
 class InvestingCalendarAnalyzer:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, calendar_ttl_seconds: int = 300):
         """
         Initialize with your Investing.com API key
+        
+        Parameters:
+        - api_key: Investing.com API key
+        - calendar_ttl_seconds: How long fetched calendars are reused before refetching
         """
         self.base_url = "https://api.investing.com/economic-calendar"
         self.headers = {
@@ -17,8 +110,28 @@ class InvestingCalendarAnalyzer:
             "Content-Type": "application/json",
             "User-Agent": "Economic Calendar Bot"
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        
+        # One client and loop per analyzer so pooled connections are reused between polls
+        self._loop = asyncio.new_event_loop()
+        self.http_client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(10, connect=3.05),
+            transport=httpx.AsyncHTTPTransport(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_connections=32),
+                retries=3
+            )
+        )
+        self._finalizer = weakref.finalize(self, _close_http_client, self._loop, self.http_client)
+        
+        # The calendar changes at most every few minutes
+        self._calendar_cache = TTLCache(maxsize=16, ttl=calendar_ttl_seconds)
+        
+        self._important_re = re.compile('|'.join(map(re.escape, IMPORTANT_EVENTS)), re.IGNORECASE)
+        
+    def close(self):
+        """Close the HTTP client"""
+        self._finalizer()
         
     def get_economic_calendar(self, 
                             start_date: Optional[datetime] = None,
@@ -39,24 +152,54 @@ class InvestingCalendarAnalyzer:
         if end_date is None:
             end_date = start_date + timedelta(days=7)
             
-        params = {
-            "start_date": start_date.strftime("%Y-%m-%d"),
-            "end_date": end_date.strftime("%Y-%m-%d"),
-            "countries": ",".join(countries),
-            "importance": ",".join(importance)
-        }
+        key = hashkey(start_date.date(), end_date.date(), tuple(countries), tuple(importance))
+        # Callers get their own copy, so edits to a returned frame never leak into the cache
+        cached = self._calendar_cache.get(key)
+        if cached is not None:
+            return cached.copy()
+            
+        # Poll each day of the range concurrently
+        chunks = [
+            {
+                "start_date": day,
+                "end_date": day,
+                "countries": ",".join(countries),
+                "importance": ",".join(importance)
+            }
+            for day in pd.date_range(start_date.date(), end_date.date()).strftime("%Y-%m-%d")
+        ]
+        
+        events = self._loop.run_until_complete(self.get_economic_calendar_async(chunks))
+        if not events.empty:
+            self._calendar_cache[key] = events.copy()
+        return events
         
+    async def get_economic_calendar_async(self, chunks: List[Dict]) -> pd.DataFrame:
+        """
+        Fetch several calendar windows from Investing.com concurrently
+        
+        Parameters:
+        - chunks: Query parameters for each window
+        """
         try:
-            response = self.session.get(
-                f"{self.base_url}/events",
-                params=params
-            )
-            response.raise_for_status()
+            responses = await asyncio.gather(*[
+                _get_with_retries(self.http_client, f"{self.base_url}/events", params)
+                for params in chunks
+            ])
             
-            data = response.json()
-            return pd.DataFrame(data['events'])
+            events = []
+            for response in responses:
+                response.raise_for_status()
+                events.extend(json_loads(response.content)['events'])
+                
+            calendar = pd.DataFrame(events)
+            for column in ('actual', 'forecast', 'previous'):
+                if column in calendar:
+                    calendar[column] = pd.to_numeric(calendar[column], errors='coerce')
+                    
+            return calendar
             
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             print(f"Error fetching calendar data: {e}")
             return pd.DataFrame()
             
@@ -64,17 +207,6 @@ class InvestingCalendarAnalyzer:
         """
         Get specific important US economic events
         """
-        important_events = {
-            "Fed Interest Rate Decision": "fed_rate",
-            "CPI": "cpi",
-            "Core CPI": "core_cpi",
-            "Manufacturing PMI": "pmi_manufacturing",
-            "Services PMI": "pmi_services",
-            "PCE Price Index": "pce",
-            "Core PCE Price Index": "core_pce",
-            "FOMC Meeting Minutes": "fomc_minutes"
-        }
-        
         events_df = self.get_economic_calendar(
             countries=["US"],
             importance=["high"]
@@ -83,108 +215,84 @@ class InvestingCalendarAnalyzer:
         if events_df.empty:
             return pd.DataFrame()
             
-        mask = events_df['event_name'].str.contains('|'.join(important_events.keys()), case=False)
+        if pc is not None:
+            # Native case-insensitive substring search over the Arrow string column
+            names = pa.array(events_df['event_name'], type=pa.string())
+            matches = [pc.match_substring(names, name, ignore_case=True) for name in IMPORTANT_EVENTS]
+            mask = functools.reduce(pc.or_kleene, matches).fill_null(False).to_numpy(zero_copy_only=False)
+        else:
+            mask = events_df['event_name'].str.contains(self._important_re)
         return events_df[mask].copy()
         
     def analyze_event_impact(self, event_data: pd.DataFrame) -> Dict:
         """
         Analyze the potential market impact of economic events
         """
-        impact_analysis = {}
-        
-        for _, event in event_data.iterrows():
-            event_name = event['event_name']
-            actual = event.get('actual')
-            forecast = event.get('forecast')
-            previous = event.get('previous')
-            
-            impact = self._calculate_impact(event_name, actual, forecast, previous)
-            impact_analysis[event_name] = impact
-            
-        return impact_analysis
-        
-    def _calculate_impact(self, event_name: str, actual, forecast, previous) -> Dict:
-        """
-        Calculate the potential market impact of an event
-        """
-        if actual is None or forecast is None:
-            return {
-                "impact": "Unknown",
-                "direction": "Neutral",
-                "strength": 0.0,
-                "notes": "Insufficient data"
-            }
-            
-        try:
-            actual = float(actual)
-            forecast = float(forecast)
-            previous = float(previous) if previous is not None else None
-            
-            surprise = actual - forecast
-            trend = actual - previous if previous is not None else 0
+        if event_data.empty:
+            return {}
             
-            # Impact calculation based on event type
-            if "Fed" in event_name or "FOMC" in event_name:
-                return self._analyze_fed_impact(surprise, trend)
-            elif "CPI" in event_name or "PCE" in event_name:
-                return self._analyze_inflation_impact(surprise, trend)
-            elif "PMI" in event_name:
-                return self._analyze_pmi_impact(surprise, trend, actual)
-            else:
-                return self._analyze_generic_impact(surprise, trend)
-                
-        except ValueError:
-            return {
-                "impact": "Unknown",
-                "direction": "Neutral",
-                "strength": 0.0,
-                "notes": "Data conversion error"
-            }
-            
-    def _analyze_fed_impact(self, surprise: float, trend: float) -> Dict:
-        """Analyze Fed-related events"""
-        impact = abs(surprise) * 2  # Fed surprises have doubled impact
-        
-        return {
-            "impact": "High" if impact > 0.5 else "Medium",
-            "direction": "Hawkish" if surprise > 0 else "Dovish",
-            "strength": min(impact, 1.0),
-            "notes": f"{'Above' if surprise > 0 else 'Below'} expectations by {abs(surprise):.2f}"
-        }
-        
-    def _analyze_inflation_impact(self, surprise: float, trend: float) -> Dict:
-        """Analyze inflation indicators"""
-        impact = abs(surprise) * 1.5
+        # Unparseable or missing values become NaN and are reported as insufficient data
+        columns = event_data.reindex(columns=['actual', 'forecast', 'previous'])
+        actual, forecast, previous = (
+            pd.to_numeric(columns[column], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            for column in ('actual', 'forecast', 'previous')
+        )
         
-        return {
-            "impact": "High" if impact > 0.3 else "Medium",
-            "direction": "Higher" if surprise > 0 else "Lower",
-            "strength": min(impact, 1.0),
-            "notes": f"Inflation {('rising' if trend > 0 else 'falling')} trend"
-        }
+        insufficient = np.isnan(actual) | np.isnan(forecast)
+        surprise = actual - forecast
+        trend = np.where(np.isnan(previous), 0, actual - previous)
         
-    def _analyze_pmi_impact(self, surprise: float, trend: float, actual: float) -> Dict:
-        """Analyze PMI data"""
-        expansion = actual > 50
-        impact = abs(surprise)
+        # Impact calculation based on event type
+        names = event_data['event_name'].astype(str)
+        kind = np.select(
+            [
+                names.str.contains("Fed|FOMC").to_numpy(),
+                names.str.contains("CPI|PCE").to_numpy(),
+                names.str.contains("PMI").to_numpy()
+            ],
+            [FED_EVENT, INFLATION_EVENT, PMI_EVENT],
+            default=GENERIC_EVENT
+        )
         
-        return {
-            "impact": "High" if impact > 2 else "Medium",
-            "direction": "Expansion" if expansion else "Contraction",
-            "strength": min(impact / 2, 1.0),
-            "notes": f"Economy {'expanding' if expansion else 'contracting'}"
-        }
+        strength = np.empty(len(kind), dtype=np.float64)
+        high = np.empty(len(kind), dtype=np.bool_)
+        rising = np.empty(len(kind), dtype=np.bool_)
+        score_surprises(
+            kind.astype(np.int64), np.nan_to_num(surprise), np.nan_to_num(actual),
+            IMPACT_SCALE, STRENGTH_DIVISOR, HIGH_IMPACT_THRESHOLD, strength, high, rising
+        )
+        impact = np.where(high, HIGH_IMPACT_LABEL[kind], LOW_IMPACT_LABEL[kind])
+        direction = np.where(rising, UP_LABEL[kind], DOWN_LABEL[kind])
         
-    def _analyze_generic_impact(self, surprise: float, trend: float) -> Dict:
-        """Analyze other economic indicators"""
-        impact = abs(surprise)
+        impact_analysis = {}
+        for i, event_name in enumerate(event_data['event_name']):
+            if insufficient[i]:
+                impact_analysis[event_name] = {
+                    "impact": "Unknown",
+                    "direction": "Neutral",
+                    "strength": 0.0,
+                    "notes": "Insufficient data"
+                }
+            else:
+                impact_analysis[event_name] = {
+                    "impact": str(impact[i]),
+                    "direction": str(direction[i]),
+                    "strength": float(strength[i]),
+                    "notes": self._impact_notes(kind[i], surprise[i], trend[i], rising[i])
+                }
+                
+        return impact_analysis
         
-        return {
-            "impact": "Medium" if impact > 0.5 else "Low",
-            "direction": "Positive" if surprise > 0 else "Negative",
-            "strength": min(impact, 1.0),
-            "notes": "General economic indicator"
-        }
+    def _impact_notes(self, kind: int, surprise: float, trend: float, rising: bool) -> str:
+        """Describe an event's impact for its event type"""
+        if kind == FED_EVENT:
+            return f"{'Above' if surprise > 0 else 'Below'} expectations by {abs(surprise):.2f}"
+        elif kind == INFLATION_EVENT:
+            return f"Inflation {('rising' if trend > 0 else 'falling')} trend"
+        elif kind == PMI_EVENT:
+            return f"Economy {'expanding' if rising else 'contracting'}"
+        else:
+            return "General economic indicator"
 
 def connect_mt5(username: int, password: str, server: str) -> bool:
     """Connect to MetaTrader 5 platform"""
@@ -240,6 +348,7 @@ def main():
         print(f"Error in main execution: {e}")
         
     finally:
+        analyzer.close()
         mt5.shutdown()
 
 if __name__ == "__main__":
@@ -1,78 +1,222 @@
+import asyncio
+import importlib.util
+import re
+import sqlite3
+import threading
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+
+import httpx
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+import numpy as np
+import pandas as pd
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the scoring kernels run as plain Python loops
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# API endpoint for economic calendar
+ECONOMIC_CALENDAR_URL = "https://api.investing.com/economic-calendar"
+
+# Gateway errors worth retrying; connection failures are retried by the transport
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Arrow-backed strings when pyarrow is installed
+EVENT_NAME_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") else "string"
+
+# Distinct events looked up per historical impact query
+HISTORY_BATCH_SIZE = 400
+
+EVENT_IMPACT_WEIGHTS = MappingProxyType({
+    "HIGH": 1.0,
+    "MEDIUM": 0.6,
+    "LOW": 0.3
+})
+
+# Define economic indicators and their impact on currencies
+INDICATOR_IMPACTS = MappingProxyType({
+    "GDP": MappingProxyType({
+        "impact_type": "HIGH",
+        "currencies": ("USD", "EUR", "GBP", "JPY", "AUD", "CAD"),
+        "interpretation": MappingProxyType({
+            "higher": "bullish",
+            "lower": "bearish",
+            "threshold": 0.2  # % difference from forecast
+        })
+    }),
+    "Interest Rate": MappingProxyType({
+        "impact_type": "HIGH",
+        "currencies": ("USD", "EUR", "GBP", "JPY", "AUD", "CAD"),
+        "interpretation": MappingProxyType({
+            "higher": "bullish",
+            "lower": "bearish",
+            "threshold": 0.25  # % points difference
+        })
+    }),
+    "NFP": MappingProxyType({
+        "impact_type": "HIGH",
+        "currencies": ("USD",),
+        "interpretation": MappingProxyType({
+            "higher": "bullish",
+            "lower": "bearish",
+            "threshold": 50000  # jobs difference
+        })
+    }),
+    "CPI": MappingProxyType({
+        "impact_type": "HIGH",
+        "currencies": ("USD", "EUR", "GBP", "JPY", "AUD", "CAD"),
+        "interpretation": MappingProxyType({
+            "higher": "bullish",
+            "lower": "bearish",
+            "threshold": 0.2  # % difference from forecast
+        })
+    }),
+    "Retail Sales": MappingProxyType({
+        "impact_type": "MEDIUM",
+        "currencies": ("USD", "EUR", "GBP", "AUD"),
+        "interpretation": MappingProxyType({
+            "higher": "bullish",
+            "lower": "bearish",
+            "threshold": 0.3  # % difference from forecast
+        })
+    }),
+    "PMI": MappingProxyType({
+        "impact_type": "MEDIUM",
+        "currencies": ("USD", "EUR", "GBP", "CNH"),
+        "interpretation": MappingProxyType({
+            "higher": "bullish",
+            "lower": "bearish",
+            "threshold": 1.0  # points difference
+        })
+    })
+})
+
+# Indicator named in an event, one regex group per indicator
+INDICATOR_PATTERN = re.compile(
+    r"(?P<gdp>gdp)|(?P<rate>interest rate)|(?P<nfp>nonfarm payrolls|nfp)"
+    r"|(?P<cpi>cpi|consumer price)|(?P<retail>retail sales)|(?P<pmi>pmi|purchasing manager)",
+    re.IGNORECASE
+)
+INDICATOR_GROUPS = MappingProxyType({
+    "gdp": "GDP",
+    "rate": "Interest Rate",
+    "nfp": "NFP",
+    "cpi": "CPI",
+    "retail": "Retail Sales",
+    "pmi": "PMI"
+})
+
+# Aligned per-indicator arrays for vectorized scoring, indexed by indicator id (regex group order)
+INDICATOR_NAMES = tuple(INDICATOR_GROUPS.values())
+INDICATOR_THRESHOLDS = np.array(
+    [INDICATOR_IMPACTS[name]['interpretation']['threshold'] for name in INDICATOR_NAMES], dtype=float
+)
+INDICATOR_HIGHER = np.array([INDICATOR_IMPACTS[name]['interpretation']['higher'] for name in INDICATOR_NAMES])
+INDICATOR_LOWER = np.array([INDICATOR_IMPACTS[name]['interpretation']['lower'] for name in INDICATOR_NAMES])
+INDICATOR_WEIGHTS = np.array(
+    [EVENT_IMPACT_WEIGHTS[INDICATOR_IMPACTS[name]['impact_type']] for name in INDICATOR_NAMES]
+)
+
+@njit(cache=True, fastmath={'nnan', 'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+def score_deviations(deviation, indicator_id, thresholds, weights, out_direction, out_strength):
+    """Score each event's deviation from forecast against its indicator's threshold and weight
+    
+    out_direction is 1 above the threshold, -1 below it and 0 otherwise or for unknown
+    indicators (id -1). Deviations must not be NaN but may be infinite (zero forecast).
+    """
+    for i in range(len(indicator_id)):
+        indicator = indicator_id[i]
+        out_direction[i] = 0
+        out_strength[i] = 0.0
+        if indicator >= 0:
+            threshold = thresholds[indicator]
+            magnitude = abs(deviation[i])
+            if magnitude > threshold:
+                out_direction[i] = 1 if deviation[i] > 0 else -1
+                out_strength[i] = min(magnitude / threshold, 1.0) * weights[indicator]
+
+def _close_http_client(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient):
+    """Close an analyzer's HTTP client and the event loop that owns its connections"""
+    if not loop.is_closed():
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+async def _get_with_retries(client: httpx.AsyncClient, url: str, params: Dict,
+                            retries: int = 3, backoff: float = 0.3) -> httpx.Response:
+    """GET url, retrying gateway errors (502/503/504) with exponential backoff"""
+    for attempt in range(retries):
+        response = await client.get(url, params=params)
+        if response.status_code not in RETRY_STATUSES:
+            return response
+        await asyncio.sleep(backoff * 2 ** attempt)
+    return await client.get(url, params=params)
+
 class EconomicAnalysis:
-    def __init__(self, investing_api_key: str):
+    def __init__(self, investing_api_key: str, calendar_ttl_seconds: int = 300):
         self.api_key = investing_api_key
-        self.event_impact_weights = {
-            "HIGH": 1.0,
-            "MEDIUM": 0.6,
-            "LOW": 0.3
-        }
+        self.event_impact_weights = EVENT_IMPACT_WEIGHTS
+        self.indicator_impacts = INDICATOR_IMPACTS
         
-        # Define economic indicators and their impact on currencies
-        self.indicator_impacts = {
-            "GDP": {
-                "impact_type": "HIGH",
-                "currencies": ["USD", "EUR", "GBP", "JPY", "AUD", "CAD"],
-                "interpretation": {
-                    "higher": "bullish",
-                    "lower": "bearish",
-                    "threshold": 0.2  # % difference from forecast
-                }
-            },
-            "Interest Rate": {
-                "impact_type": "HIGH",
-                "currencies": ["USD", "EUR", "GBP", "JPY", "AUD", "CAD"],
-                "interpretation": {
-                    "higher": "bullish",
-                    "lower": "bearish",
-                    "threshold": 0.25  # % points difference
-                }
-            },
-            "NFP": {
-                "impact_type": "HIGH",
-                "currencies": ["USD"],
-                "interpretation": {
-                    "higher": "bullish",
-                    "lower": "bearish",
-                    "threshold": 50000  # jobs difference
-                }
-            },
-            "CPI": {
-                "impact_type": "HIGH",
-                "currencies": ["USD", "EUR", "GBP", "JPY", "AUD", "CAD"],
-                "interpretation": {
-                    "higher": "bullish",
-                    "lower": "bearish",
-                    "threshold": 0.2  # % difference from forecast
-                }
-            },
-            "Retail Sales": {
-                "impact_type": "MEDIUM",
-                "currencies": ["USD", "EUR", "GBP", "AUD"],
-                "interpretation": {
-                    "higher": "bullish",
-                    "lower": "bearish",
-                    "threshold": 0.3  # % difference from forecast
-                }
+        # One client and loop per analyzer so pooled connections are reused between polls
+        self._loop = asyncio.new_event_loop()
+        self.http_client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
             },
-            "PMI": {
-                "impact_type": "MEDIUM",
-                "currencies": ["USD", "EUR", "GBP", "CNH"],
-                "interpretation": {
-                    "higher": "bullish",
-                    "lower": "bearish",
-                    "threshold": 1.0  # points difference
-                }
-            }
-        }
+            timeout=httpx.Timeout(10, connect=3.05),
+            transport=httpx.AsyncHTTPTransport(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_connections=32),
+                retries=3
+            )
+        )
+        self._finalizer = weakref.finalize(self, _close_http_client, self._loop, self.http_client)
+        
+        # The calendar changes at most every few minutes
+        self._calendar_cache = TTLCache(maxsize=16, ttl=calendar_ttl_seconds)
+        
+        # Average historical impact per (event_name, country, symbol), cleared when impacts are recorded
+        self._history_cache = TTLCache(maxsize=2048, ttl=calendar_ttl_seconds)
+        self._history_lock = threading.Lock()
         
         # Initialize database connection for historical data
         self.initialize_database()
         
+    def close(self):
+        """Close the HTTP client and database connection"""
+        self._finalizer()
+        if self._db_finalizer.alive:
+            self.cursor.execute('PRAGMA optimize')
+            self._db_finalizer()
+        
     def initialize_database(self):
         """Initialize SQLite database for storing historical economic data"""
-        import sqlite3
-        self.conn = sqlite3.connect('economic_data.db')
+        # One long-lived connection, shared by worker threads; writers serialize on the lock
+        self.conn = sqlite3.connect('economic_data.db', check_same_thread=False)
         self.cursor = self.conn.cursor()
+        self._write_lock = threading.Lock()
+        self._db_finalizer = weakref.finalize(self, self.conn.close)
+        
+        # WAL lets a commit append to the log instead of syncing the whole database
+        self.cursor.execute('PRAGMA journal_mode=WAL')
+        self.cursor.execute('PRAGMA synchronous=NORMAL')
+        self.cursor.execute('PRAGMA mmap_size=268435456')  # 256 MB
+        self.cursor.execute('PRAGMA cache_size=-65536')  # 64 MB
+        self.cursor.execute('PRAGMA temp_store=MEMORY')
         
         # Create tables if they don't exist
         self.cursor.execute('''
@@ -101,49 +245,115 @@ class EconomicAnalysis:
             )
         ''')
         
+        # One row per scheduled event, so refetching updates it in place
+        has_unique_index = self.cursor.execute('''
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'index' AND name = 'ux_events_name_country_date'
+        ''').fetchone()
+        if not has_unique_index:
+            self.deduplicate_events()
+            self.cursor.execute('''
+                CREATE UNIQUE INDEX ux_events_name_country_date
+                ON economic_events (event_name, country, date)
+            ''')
+            
+        # Covers the impact lookup in get_historical_impacts without touching the table
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS ix_impacts_event_symbol
+            ON event_impacts (event_id, symbol, price_impact, volatility_impact, duration_hours)
+        ''')
+        
         self.conn.commit()
         
+    def deduplicate_events(self):
+        """Collapse repeated copies of an event onto its first row"""
+        self.cursor.execute('''
+            UPDATE event_impacts
+            SET event_id = (
+                SELECT MIN(first.id)
+                FROM economic_events dup
+                JOIN economic_events first
+                    ON first.event_name IS dup.event_name
+                    AND first.country IS dup.country
+                    AND first.date IS dup.date
+                WHERE dup.id = event_impacts.event_id
+            )
+            WHERE event_id IN (SELECT id FROM economic_events)
+        ''')
+        
+        self.cursor.execute('''
+            DELETE FROM economic_events
+            WHERE id NOT IN (
+                SELECT MIN(id) FROM economic_events
+                GROUP BY event_name, country, date
+            )
+        ''')
+        
     def fetch_economic_events(self) -> pd.DataFrame:
         """Fetch economic events from Investing.com and store in database"""
-        try:
-            # API endpoint for economic calendar
-            url = "https://api.investing.com/economic-calendar"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Get events for past week and upcoming week
-            end_date = datetime.now() + timedelta(days=7)
-            start_date = datetime.now() - timedelta(days=7)
+        # Get events for past week and upcoming week, one request per day
+        end_date = datetime.now() + timedelta(days=7)
+        start_date = datetime.now() - timedelta(days=7)
+        
+        key = hashkey(start_date.date(), end_date.date())
+        # Callers get their own copy, so edits to a returned frame never leak into the cache
+        cached = self._calendar_cache.get(key)
+        if cached is not None:
+            return cached.copy()
             
-            params = {
-                "start_date": start_date.strftime("%Y-%m-%d"),
-                "end_date": end_date.strftime("%Y-%m-%d"),
+        chunks = [
+            {
+                "start_date": day,
+                "end_date": day,
                 "importance[]": ["1", "2", "3"]  # High, Medium, Low importance
             }
+            for day in pd.date_range(start_date.date(), end_date.date()).strftime("%Y-%m-%d")
+        ]
+        
+        events = self._loop.run_until_complete(self.fetch_economic_events_async(chunks))
+        if not events.empty:
+            self._calendar_cache[key] = events.copy()
+        return events
+        
+    async def fetch_economic_events_async(self, chunks: List[Dict]) -> pd.DataFrame:
+        """Fetch several calendar windows concurrently and store the events in database"""
+        try:
+            responses = await asyncio.gather(*[
+                _get_with_retries(self.http_client, ECONOMIC_CALENDAR_URL, params)
+                for params in chunks
+            ])
             
-            response = requests.get(url, headers=headers, params=params)
-            events_data = response.json()
+            # Process and store events, collecting each column in one pass
+            names, countries, dates, actuals, forecasts, previouses, impacts = ([] for _ in range(7))
+            for response in responses:
+                response.raise_for_status()
+                for event in json_loads(response.content)['data']:
+                    names.append(event['event_name'])
+                    countries.append(event['country'])
+                    dates.append(event['date'])
+                    actuals.append(event.get('actual'))
+                    forecasts.append(event.get('forecast'))
+                    previouses.append(event.get('previous'))
+                    impacts.append(event['importance'])
+                    
+            events = pd.DataFrame({
+                "event_name": names,
+                "country": pd.Categorical(countries),
+                "date": dates,
+                "actual": pd.to_numeric(actuals, errors='coerce').astype(float),
+                "forecast": pd.to_numeric(forecasts, errors='coerce').astype(float),
+                "previous": pd.to_numeric(previouses, errors='coerce').astype(float),
+                "impact": pd.Categorical(impacts)
+            })
             
-            # Process and store events
-            events = []
-            for event in events_data['data']:
-                event_info = {
-                    "event_name": event['event_name'],
-                    "country": event['country'],
-                    "date": event['date'],
-                    "actual": event.get('actual', None),
-                    "forecast": event.get('forecast', None),
-                    "previous": event.get('previous', None),
-                    "impact": event['importance']
-                }
-                events.append(event_info)
-                
-                # Store in database
-                self.store_event(event_info)
+            # Store in database
+            self.store_events(events)
+            
+            # Shrink the frame callers keep: Arrow-backed names and categorical labels.
+            # Numbers stay float64 so deviations match the scoring thresholds exactly.
+            events['event_name'] = events['event_name'].astype(EVENT_NAME_DTYPE)
                 
-            return pd.DataFrame(events)
+            return events
             
         except Exception as e:
             print(f"Error fetching economic events: {e}")
@@ -151,94 +361,120 @@ class EconomicAnalysis:
             
     def store_event(self, event: Dict):
         """Store economic event in database"""
+        self.store_events(pd.DataFrame([event]))
+        
+    def store_events(self, events: pd.DataFrame):
+        """Store economic events in database in a single transaction"""
         try:
-            self.cursor.execute('''
-                INSERT INTO economic_events 
-                (event_name, country, date, actual, forecast, previous, impact)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                event['event_name'],
-                event['country'],
-                event['date'],
-                event['actual'],
-                event['forecast'],
-                event['previous'],
-                event['impact']
-            ))
-            self.conn.commit()
+            with self._write_lock, self.conn:
+                self.conn.executemany('''
+                    INSERT INTO economic_events 
+                    (event_name, country, date, actual, forecast, previous, impact)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (event_name, country, date) DO UPDATE SET
+                        actual = excluded.actual,
+                        forecast = excluded.forecast,
+                        previous = excluded.previous,
+                        impact = excluded.impact
+                ''', events[
+                    ['event_name', 'country', 'date', 'actual', 'forecast', 'previous', 'impact']
+                ].itertuples(index=False, name=None))
             
         except Exception as e:
-            print(f"Error storing event: {e}")
+            print(f"Error storing events: {e}")
             
     def analyze_event_impact(self, event: Dict, symbol: str) -> Dict:
         """Analyze impact of economic event compared to historical patterns"""
         try:
-            # Get event history
-            historical_impacts = self.get_historical_impacts(
-                event['event_name'],
-                event['country'],
-                symbol
-            )
-            
-            # Calculate deviation from forecast
-            if event['actual'] is not None and event['forecast'] is not None:
-                deviation = (event['actual'] - event['forecast']) / event['forecast']
-            else:
-                deviation = 0
-                
-            # Get indicator parameters
-            indicator = self.get_indicator_type(event['event_name'])
-            if indicator in self.indicator_impacts:
-                impact_params = self.indicator_impacts[indicator]
-                threshold = impact_params['interpretation']['threshold']
-                
-                # Determine impact direction
-                if abs(deviation) > threshold:
-                    direction = impact_params['interpretation']['higher'] if deviation > 0 else impact_params['interpretation']['lower']
-                    strength = min(abs(deviation / threshold), 1.0) * self.event_impact_weights[impact_params['impact_type']]
-                else:
-                    direction = "neutral"
-                    strength = 0
-                    
-                # Compare with historical impact
-                if historical_impacts:
-                    avg_historical_impact = historical_impacts['price_impact'].mean()
-                    avg_historical_volatility = historical_impacts['volatility_impact'].mean()
-                    expected_duration = int(historical_impacts['duration_hours'].mean())
-                else:
-                    avg_historical_impact = 0
-                    avg_historical_volatility = 0
-                    expected_duration = 24
-                    
-                return {
-                    "direction": direction,
-                    "strength": strength,
-                    "deviation_from_forecast": deviation,
-                    "historical_impact": avg_historical_impact,
-                    "expected_volatility": avg_historical_volatility,
-                    "expected_duration": expected_duration,
-                    "notes": f"Historical average impact: {avg_historical_impact:.2f}%"
-                }
-                
-            return {
-                "direction": "neutral",
-                "strength": 0,
-                "deviation_from_forecast": 0,
-                "historical_impact": 0,
-                "expected_volatility": 0,
-                "expected_duration": 24,
-                "notes": "Unknown event type"
-            }
+            impacts = self.analyze_event_impacts_batch(pd.DataFrame([dict(event)]), symbol)
+            return self._impact_dict(next(impacts.itertuples(index=False)))
             
         except Exception as e:
             print(f"Error analyzing event impact: {e}")
             return {}
             
-    def get_historical_impacts(self, event_name: str, country: str, symbol: str) -> pd.DataFrame:
-        """Get historical impact data for similar events"""
+    def score_events(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Score direction and strength of every event against its indicator threshold"""
+        columns = events.reindex(columns=['event_name', 'actual', 'forecast'])
+        actual = pd.to_numeric(columns['actual'], errors='coerce')
+        forecast = pd.to_numeric(columns['forecast'], errors='coerce')
+        
+        # Calculate deviation from forecast; a zero forecast gives +/-inf, scored at full strength
+        deviation = ((actual - forecast) / forecast).fillna(0).to_numpy()
+        
+        # Get indicator parameters
+        matched = columns['event_name'].astype(str).str.extract(INDICATOR_PATTERN).notna().to_numpy()
+        indicator_id = np.where(matched.any(axis=1), matched.argmax(axis=1), -1)
+        known = indicator_id >= 0
+        ids = np.where(known, indicator_id, 0)
+        
+        # Determine impact direction
+        direction_id = np.empty(len(indicator_id), dtype=np.int8)
+        strength = np.empty(len(indicator_id), dtype=np.float64)
+        score_deviations(
+            deviation.astype(np.float64), indicator_id.astype(np.int64),
+            INDICATOR_THRESHOLDS, INDICATOR_WEIGHTS, direction_id, strength
+        )
+        direction = np.select(
+            [direction_id > 0, direction_id < 0],
+            [INDICATOR_HIGHER[ids], INDICATOR_LOWER[ids]],
+            "neutral"
+        )
+        
+        return pd.DataFrame({
+            "indicator_id": indicator_id,
+            "direction": direction,
+            "strength": strength,
+            "deviation_from_forecast": np.where(known, deviation, 0.0)
+        }, index=events.index)
+        
+    def analyze_event_impacts_batch(self, events: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Analyze impact of every event compared to historical patterns, one row per event"""
+        impacts = self.score_events(events)
+        known = (impacts['indicator_id'] >= 0).to_numpy()
+        
+        # Compare with historical impact
+        if known.any():
+            history = self.get_historical_impacts_batch(events[known], symbol).reindex(
+                pd.MultiIndex.from_arrays([
+                    events['event_name'].astype(str),
+                    events['country'].astype(str)
+                ])
+            )
+            price_impact = history['price_impact'].to_numpy(dtype=float)
+            volatility_impact = history['volatility_impact'].to_numpy(dtype=float)
+            duration_hours = history['duration_hours'].to_numpy(dtype=float)
+        else:
+            price_impact = volatility_impact = duration_hours = np.full(len(events), np.nan)
+            
+        has_history = known & ~np.isnan(price_impact)
+        impacts['known'] = known
+        impacts['historical_impact'] = np.where(has_history, price_impact, 0.0)
+        impacts['expected_volatility'] = np.where(has_history, volatility_impact, 0.0)
+        impacts['expected_duration'] = np.where(has_history, np.trunc(duration_hours), 24).astype(int)
+        
+        return impacts
+        
+    def _impact_dict(self, impact) -> Dict:
+        """Event impact as returned by analyze_event_impact, from an analyze_event_impacts_batch row"""
+        return {
+            "direction": impact.direction,
+            "strength": float(impact.strength),
+            "deviation_from_forecast": float(impact.deviation_from_forecast),
+            "historical_impact": float(impact.historical_impact),
+            "expected_volatility": float(impact.expected_volatility),
+            "expected_duration": int(impact.expected_duration),
+            "notes": (
+                f"Historical average impact: {impact.historical_impact:.2f}%"
+                if impact.known else "Unknown event type"
+            )
+        }
+        
+    def get_historical_impacts(self, event_name: str, country: str, symbol: str) -> Tuple[float, float, float]:
+        """Get average (price impact, volatility impact, duration hours) of similar events"""
         try:
             query = '''
-                SELECT ei.*
+                SELECT ei.price_impact, ei.volatility_impact, ei.duration_hours
                 FROM event_impacts ei
                 JOIN economic_events ee ON ei.event_id = ee.id
                 WHERE ee.event_name = ? 
@@ -248,52 +484,106 @@ class EconomicAnalysis:
                 LIMIT 10
             '''
             
-            return pd.read_sql_query(
-                query,
-                self.conn,
-                params=(event_name, country, symbol)
-            )
+            rows = self.conn.execute(query, (event_name, country, symbol)).fetchall()
+            if rows:
+                return tuple(np.array(rows, dtype=np.float64).mean(axis=0).tolist())
+                
+        except Exception as e:
+            print(f"Error getting historical impacts: {e}")
             
+        return (0.0, 0.0, 24.0)
+        
+    def get_historical_impacts_batch(self, events: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Get average historical impact of each distinct event, indexed by (event_name, country)"""
+        columns = ['price_impact', 'volatility_impact', 'duration_hours']
+        keys = [] if events.empty else [
+            tuple(key) for key in events[['event_name', 'country']].drop_duplicates().to_numpy().tolist()
+        ]
+        
+        # Reuse recent lookups; an empty tuple marks an event with no recorded impact
+        averages = {}
+        with self._history_lock:
+            for key in keys:
+                cached = self._history_cache.get(key + (symbol,))
+                if cached is not None:
+                    averages[key] = cached
+        missing = [key for key in keys if key not in averages]
+        
+        try:
+            # Stay well under SQLite's bound-parameter limit
+            history = defaultdict(list)
+            for start in range(0, len(missing), HISTORY_BATCH_SIZE):
+                batch = missing[start:start + HISTORY_BATCH_SIZE]
+                query = f'''
+                    WITH keys (event_name, country) AS (
+                        VALUES {", ".join(["(?, ?)"] * len(batch))}
+                    ),
+                    recent AS (
+                        SELECT ee.event_name, ee.country,
+                            ei.price_impact, ei.volatility_impact, ei.duration_hours,
+                            ROW_NUMBER() OVER (
+                                PARTITION BY ee.event_name, ee.country
+                                ORDER BY ee.date DESC
+                            ) AS recency
+                        FROM keys k
+                        JOIN economic_events ee
+                            ON ee.event_name = k.event_name AND ee.country = k.country
+                        JOIN event_impacts ei ON ei.event_id = ee.id
+                        WHERE ei.symbol = ?
+                    )
+                    SELECT event_name, country, price_impact, volatility_impact, duration_hours
+                    FROM recent
+                    WHERE recency <= 10
+                '''
+                params = [value for key in batch for value in key] + [symbol]
+                for event_name, country, *impact in self.conn.execute(query, params).fetchall():
+                    history[(event_name, country)].append(impact)
+                    
+            fetched = {
+                key: tuple(np.array(impacts, dtype=np.float64).mean(axis=0).tolist())
+                for key, impacts in history.items()
+            }
+            
+            with self._history_lock:
+                for key in missing:
+                    averages[key] = fetched.get(key, ())
+                    self._history_cache[key + (symbol,)] = averages[key]
+                    
         except Exception as e:
             print(f"Error getting historical impacts: {e}")
-            return pd.DataFrame()
             
+        found = {key: value for key, value in averages.items() if value}
+        return pd.DataFrame(
+            list(found.values()),
+            columns=columns,
+            index=pd.MultiIndex.from_tuples(list(found), names=['event_name', 'country'])
+        )
+        
     def get_indicator_type(self, event_name: str) -> str:
         """Determine indicator type from event name"""
-        event_lower = event_name.lower()
-        
-        if "gdp" in event_lower:
-            return "GDP"
-        elif "interest rate" in event_lower:
-            return "Interest Rate"
-        elif "nonfarm payrolls" in event_lower or "nfp" in event_lower:
-            return "NFP"
-        elif "cpi" in event_lower or "consumer price" in event_lower:
-            return "CPI"
-        elif "retail sales" in event_lower:
-            return "Retail Sales"
-        elif "pmi" in event_lower or "purchasing manager" in event_lower:
-            return "PMI"
-        else:
-            return "Unknown"
+        match = INDICATOR_PATTERN.search(event_name)
+        return INDICATOR_GROUPS[match.lastgroup] if match else "Unknown"
             
     def update_impact_history(self, event_id: int, symbol: str, 
                             price_impact: float, volatility_impact: float,
                             duration_hours: int):
         """Store actual impact of event for future reference"""
         try:
-            self.cursor.execute('''
-                INSERT INTO event_impacts 
-                (event_id, symbol, price_impact, volatility_impact, duration_hours)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                event_id,
-                symbol,
-                price_impact,
-                volatility_impact,
-                duration_hours
-            ))
-            self.conn.commit()
+            with self._write_lock, self.conn:
+                self.conn.execute('''
+                    INSERT INTO event_impacts 
+                    (event_id, symbol, price_impact, volatility_impact, duration_hours)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    event_id,
+                    symbol,
+                    price_impact,
+                    volatility_impact,
+                    duration_hours
+                ))
+                
+            with self._history_lock:
+                self._history_cache.clear()
             
         except Exception as e:
             print(f"Error updating impact history: {e}")
@@ -301,28 +591,30 @@ class EconomicAnalysis:
     def analyze_combined_impact(self, events: pd.DataFrame, symbol: str) -> Dict:
         """Analyze combined impact of multiple events"""
         try:
-            total_impact = 0
-            max_volatility = 0
-            relevant_events = []
+            impacts = self.analyze_event_impacts_batch(events, symbol)
+            direction = impacts['direction'].to_numpy()
+            strength = impacts['strength'].to_numpy()
+            significant = direction != "neutral"
+            
+            total_impact = np.where(
+                direction == "bearish", -strength, np.where(direction == "bullish", strength, 0)
+            ).sum()
             
-            for _, event in events.iterrows():
-                impact = self.analyze_event_impact(event, symbol)
-                
-                if impact['direction'] != "neutral":
-                    impact_score = impact['strength']
-                    if impact['direction'] == "bearish":
-                        impact_score *= -1
-                        
-                    total_impact += impact_score
-                    max_volatility = max(max_volatility, impact['expected_volatility'])
-                    relevant_events.append({
-                        "event": event['event_name'],
-                        "impact": impact
-                    })
-                    
             # Normalize combined impact to -1 to 1 range
-            if relevant_events:
+            if significant.any():
                 normalized_impact = np.tanh(total_impact)
+                max_volatility = max(0, np.nanmax(impacts['expected_volatility'].to_numpy()[significant]))
+                
+                relevant_events = [
+                    {
+                        "event": event_name,
+                        "impact": self._impact_dict(impact)
+                    }
+                    for event_name, impact in zip(
+                        events['event_name'].to_numpy()[significant],
+                        impacts[significant].itertuples(index=False)
+                    )
+                ]
                 
                 return {
                     "direction": "bullish" if normalized_impact > 0 else "bearish",
@@ -347,22 +639,37 @@ class EconomicAnalysis:
 # Add this method to the MultiSymbolTradingSystem class
 def analyze_economic_calendar(self) -> Dict[str, Dict]:
     """Analyze economic calendar for all symbols"""
-    economic_analyzer = EconomicAnalysis(self.investing_api_key)
+    # Keep one analyzer so its HTTP client is reused across calls
+    if getattr(self, 'economic_analyzer', None) is None:
+        self.economic_analyzer = EconomicAnalysis(self.investing_api_key)
+    economic_analyzer = self.economic_analyzer
     events = economic_analyzer.fetch_economic_events()
     
-    symbol_impacts = {}
-    for symbol in self.symbols.keys():
-        # Get currency pairs from symbol
-        currencies = self.get_symbol_currencies(symbol)
-        
-        # Filter events for relevant currencies
-        relevant_events = events[events['country'].isin(currencies)]
-        
-        # Analyze combined impact
-        impact = economic_analyzer.analyze_combined_impact(relevant_events, symbol)
-        symbol_impacts[symbol] = impact
-        
-    return symbol_impacts
+    # Row positions of each country's events, shared by every symbol
+    rows_by_country = events.groupby('country', observed=True).indices if not events.empty else {}
+    events_by_currencies = {}
+    
+    # Symbols are independent, so analyze them concurrently. Only analyze_combined_impact is
+    # safe to share across threads; fetch_economic_events drives the analyzer's own event loop
+    futures = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(self.symbols)))) as executor:
+        for symbol in self.symbols.keys():
+            # Get currency pairs from symbol
+            currencies = self.get_symbol_currencies(symbol)
+            
+            # Filter events for relevant currencies, once per distinct currency set
+            currency_set = frozenset(currencies)
+            if currency_set not in events_by_currencies:
+                rows = [rows_by_country[currency] for currency in currency_set if currency in rows_by_country]
+                events_by_currencies[currency_set] = (
+                    events.take(np.sort(np.concatenate(rows))) if rows else events.iloc[:0]
+                )
+            relevant_events = events_by_currencies[currency_set]
+            
+            # Analyze combined impact
+            futures[symbol] = executor.submit(economic_analyzer.analyze_combined_impact, relevant_events, symbol)
+            
+    return {symbol: future.result() for symbol, future in futures.items()}
 
 def get_symbol_currencies(self, symbol: str) -> List[str]:
     """Extract currencies from symbol"""